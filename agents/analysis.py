@@ -1,17 +1,55 @@
+import numpy as np
 from agents.base_agent import BaseAgent
+
+def select_critical_machines(df, top_n=10):
+    """Les top_n machines critiques les moins utilisées, sans copie du DataFrame"""
+    if top_n <= 0:
+        return []
+    utilization = df['Utilization_Rate'].to_numpy(dtype=np.float64)
+    idx = np.flatnonzero(utilization < 0.4)
+    if len(idx) > top_n:
+        # Valeur du top_n-ième plus petit par sélection partielle, sans tri complet
+        kth = np.partition(utilization[idx], top_n - 1)[top_n - 1]
+        below = idx[utilization[idx] < kth]
+        ties = idx[utilization[idx] == kth][:top_n - len(below)]
+        idx = np.concatenate([below, ties])
+    idx = idx[np.argsort(utilization[idx], kind='stable')]
+    # take() ne lit que les lignes retenues (pas de conversion de la colonne entière)
+    ids = df['Machine_ID'].take(idx).tolist()
+    types = df['Machine_Type'].take(idx).tolist()
+    return [{'Machine_ID': m, 'Machine_Type': t} for m, t in zip(ids, types)]
+
 class AnalysisAgent(BaseAgent):
+    __slots__ = ()
+
+    KPI_COLUMNS = ('Utilization_Rate', 'Energy_Efficiency', 'Stability_Index')
+
     def analyze(self, df):
         self.send_message("Analyse des KPI de production")
-        
+
+        # Une seule réduction pour toutes les moyennes
+        means = df[list(self.KPI_COLUMNS)].mean()
+
+        # Vues NumPy des KPI lus par les masques
+        utilization = df['Utilization_Rate'].to_numpy()
+        stability = df['Stability_Index'].to_numpy()
+        # Identifiants lus uniquement aux positions retenues par les masques
+        machine_ids = df['Machine_ID']
+        under_used = utilization < 0.4
+
+        # Pas d'arrondi ici : rapport, prompt et dashboard formatent à l'affichage
         summary = {
-            "avg_utilization": round(df['Utilization_Rate'].mean(), 3),
-            "avg_energy_efficiency": round(df['Energy_Efficiency'].mean(), 3),
-            "avg_stability": round(df['Stability_Index'].mean(), 2),
-            "machines_sous_utilisees": df[df['Utilization_Rate'] < 0.4]['Machine_ID'].tolist(),
-            "machines_instables": df[df['Stability_Index'] > df['Stability_Index'].mean()]['Machine_ID'].tolist(),
+            "avg_utilization": float(means['Utilization_Rate']),
+            "avg_energy_efficiency": float(means['Energy_Efficiency']),
+            "avg_stability": float(means['Stability_Index']),
+            "machines_sous_utilisees": machine_ids.take(np.flatnonzero(under_used)).tolist(),
+            "machines_instables": machine_ids.take(np.flatnonzero(stability > means['Stability_Index'])).tolist(),
             "total_machines": len(df),
-            "critical_machine_count": len(df[df['Utilization_Rate'] < 0.4])
+            "critical_machine_count": int(under_used.sum())
         }
-        
+
         return summary
 
+    def critical_machines(self, df, top_n=10):
+        """Machines critiques du DataFrame (top_n moins utilisées sous le seuil)"""
+        return select_critical_machines(df, top_n)
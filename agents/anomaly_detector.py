@@ -1,17 +1,36 @@
+import numpy as np
 from agents.base_agent import BaseAgent
 class AnomalyDetectorAgent(BaseAgent):
+    __slots__ = ()
+
+    # Catégorie d'anomalie -> colonne comparée à son 95e percentile
+    PERCENTILE_COLUMNS = {
+        "high_temperature": 'Temperature_C',
+        "high_vibration": 'Vibration_mms',
+        "energy_spikes": 'Energy_Efficiency'
+    }
+
     def detect_anomalies(self, df, summary):
         """Détecte les anomalies statistiques"""
         self.send_message("Détection des anomalies")
-        
+
+        # Vues NumPy extraites une seule fois
+        cols = list(self.PERCENTILE_COLUMNS.values())
+        arrs = {col: df[col].to_numpy() for col in cols + ['Utilization_Rate']}
+        # Identifiants lus uniquement aux positions retenues par les masques
+        machine_ids = df['Machine_ID']
+
+        # Tous les seuils au 95e percentile en une passe NumPy (NaN ignorés)
+        stacked = np.column_stack([arrs[col] for col in cols])
+        q95 = dict(zip(cols, np.nanquantile(stacked, 0.95, axis=0)))
+
         anomalies = {
-            "high_temperature": df[df['Temperature_C'] > df['Temperature_C'].quantile(0.95)]['Machine_ID'].tolist(),
-            "high_vibration": df[df['Vibration_mms'] > df['Vibration_mms'].quantile(0.95)]['Machine_ID'].tolist(),
-            "energy_spikes": df[df['Energy_Efficiency'] > df['Energy_Efficiency'].quantile(0.95)]['Machine_ID'].tolist(),
-            "zero_utilization": df[df['Utilization_Rate'] == 0]['Machine_ID'].tolist()
+            category: machine_ids.take(np.flatnonzero(arrs[col] > q95[col])).tolist()
+            for category, col in self.PERCENTILE_COLUMNS.items()
         }
-        
+        anomalies["zero_utilization"] = machine_ids.take(np.flatnonzero(arrs['Utilization_Rate'] == 0)).tolist()
+
         total_anomalies = sum(len(v) for v in anomalies.values())
         self.send_message(f"🔍 {total_anomalies} anomalies détectées")
-        
-        return anomalies
\ No newline at end of file
+
+        return anomalies
@@ -1,18 +1,61 @@
+import atexit
+import sys
+import time
+from collections import deque
 from datetime import datetime
 class BaseAgent:
+    # Tous les agents déclarent __slots__ : les options ci-dessous se règlent sur la classe
+    # (ex. BaseAgent.QUIET = True), pas sur une instance
+    __slots__ = ("name", "message_history")
+    
+    # Passer à True pour couper l'affichage console des messages
+    QUIET = False
+    # Passer à True pour conserver et afficher les messages DEBUG
+    DEBUG = False
+    # Passer à True pour écrire chaque message immédiatement (usage interactif)
+    VERBOSE = False
+    # Nombre maximal de messages conservés par agent
+    MAX_HISTORY = 1000
+    # Lignes en attente d'écriture, partagées par tous les agents pour garder l'ordre
+    _log_buffer = deque()
+
     def __init__(self, name):
         self.name = name
-        self.message_history = []
+        self.message_history = deque(maxlen=self.MAX_HISTORY)
     
     def send_message(self, message, level="INFO"):
+        # DEBUG inactif : rien n'est formaté ni conservé
+        if level == "DEBUG" and not self.DEBUG:
+            return
+        # Message paresseux : callable évalué seulement s'il est retenu
+        if callable(message):
+            message = message()
         msg = {
             "agent": self.name,
             "message": message,
             "level": level,
-            "timestamp": datetime.now()
+            "timestamp_ns": time.time_ns()
         }
         self.message_history.append(msg)
-        print(f"[{level}][{self.name}] {message}")
+        if not self.QUIET:
+            self._log_buffer.append(f"[{level}][{self.name}] {message}")
+            if self.VERBOSE:
+                self.flush_messages()
+    
+    @classmethod
+    def flush_messages(cls):
+        """Écrit en une seule fois les messages en attente sur stderr"""
+        if cls._log_buffer:
+            lines = [cls._log_buffer.popleft() for _ in range(len(cls._log_buffer))]
+            sys.stderr.write("\n".join(lines) + "\n")
+            sys.stderr.flush()
     
     def get_history(self):
-        return self.message_history
\ No newline at end of file
+        """Historique des messages, horodatage formaté à la lecture"""
+        return [
+            {**msg, "timestamp": datetime.fromtimestamp(msg["timestamp_ns"] / 1e9)}
+            for msg in self.message_history
+        ]
+
+
+atexit.register(BaseAgent.flush_messages)
@@ -1,15 +1,64 @@
+import os
 import pandas as pd
 from agents.base_agent import BaseAgent
 from datetime import datetime
 
+# Moteur pyarrow (lecture CSV multi-thread) si disponible
+try:
+    import pyarrow
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Polars (lecture CSV parallèle) en option
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
 class DataCollectorAgent(BaseAgent):
+    __slots__ = ("use_polars", "max_rows")
+    
+    def __init__(self, name="Collecteur", use_polars=False, max_rows=None):
+        super().__init__(name)
+        self.use_polars = use_polars and POLARS_AVAILABLE
+        # Limite de lignes lues (échantillon de tête) pour les très gros fichiers
+        self.max_rows = max_rows
+    
     def load_data(self, path):
         self.send_message("Chargement des données industrielles")
-        df = pd.read_csv(path)
+        
+        df = self._read(path)
+        
+        # Une ligne de plus est lue pour savoir si le fichier dépasse la limite
+        if self.max_rows is not None and len(df) > self.max_rows:
+            df = df.head(self.max_rows)
+            self.send_message(f"Lecture limitée aux {self.max_rows} premières lignes", "WARNING")
         
         return {
             "data": df,
             "status": "loaded",
             "row_count": len(df),
-            "columns": list(df.columns)
-        }
\ No newline at end of file
+            "columns": df.columns.tolist()
+        }
+    
+    def _read(self, path):
+        """Lecture selon l'extension : Parquet, JSON / JSON Lines, CSV par défaut"""
+        suffix = os.path.splitext(os.fspath(path))[1].lower() if isinstance(path, (str, os.PathLike)) else ""
+        limit = None if self.max_rows is None else self.max_rows + 1
+        if suffix == ".parquet":
+            df = pd.read_parquet(path)
+            return df if limit is None else df.head(limit)
+        if suffix in (".jsonl", ".ndjson"):
+            return pd.read_json(path, lines=True, nrows=limit)
+        if suffix == ".json":
+            df = pd.read_json(path)
+            return df if limit is None else df.head(limit)
+        if self.use_polars:
+            # Conversion vers pandas uniquement à la frontière de l'agent
+            return pl.read_csv(path, n_rows=limit, infer_schema_length=None).to_pandas()
+        if PYARROW_AVAILABLE and limit is None:
+            # Le moteur pyarrow ne supporte pas nrows
+            return pd.read_csv(path, engine="pyarrow")
+        return pd.read_csv(path, nrows=limit, low_memory=False)
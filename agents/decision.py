@@ -1,5 +1,31 @@
+import re
 from agents.base_agent import BaseAgent
+
+# Recherche insensible à la casse, sans copie minuscule du texte LLM
+_RISK_RE = re.compile(r"risque", re.IGNORECASE)
+
 class DecisionAgent(BaseAgent):
+    __slots__ = ()
+    
+    # Règles évaluées dans l'ordre : (condition, décision, passe en URGENT)
+    RULES = (
+        # Décisions basées sur KPI
+        (lambda summary, counts, llm_result, qc_result:
+             summary['critical_machine_count'] > summary['total_machines'] * 0.3,
+         "⚠️ MAINTENANCE MASSIVE requise (>30% machines critiques)", True),
+        # Décisions basées sur anomalies
+        (lambda summary, counts, llm_result, qc_result: counts['high_temperature'] > 5,
+         "🌡️ Refroidissement urgent nécessaire", True),
+        (lambda summary, counts, llm_result, qc_result: counts['zero_utilization'] > 0,
+         "🔧 Vérifier machines à l'arrêt", False),
+        # Décisions basées sur LLM
+        (lambda summary, counts, llm_result, qc_result: not qc_result['valid'],
+         "⚠️ Analyse LLM nécessite révision", False),
+        (lambda summary, counts, llm_result, qc_result:
+             _RISK_RE.search(llm_result["text"]) is not None,
+         "📊 Audit approfondi recommandé", False),
+    )
+    
     def decide(self, summary, anomalies, llm_result, qc_result):
         """Prend des décisions basées sur toutes les analyses"""
         self.send_message("Prise de décision stratégique")
@@ -7,25 +33,14 @@ class DecisionAgent(BaseAgent):
         decisions = []
         priority = "NORMAL"
         
-        # Décisions basées sur KPI
-        if summary['critical_machine_count'] > summary['total_machines'] * 0.3:
-            decisions.append("⚠️ MAINTENANCE MASSIVE requise (>30% machines critiques)")
-            priority = "URGENT"
-        
-        # Décisions basées sur anomalies
-        if len(anomalies['high_temperature']) > 5:
-            decisions.append("🌡️ Refroidissement urgent nécessaire")
-            priority = "URGENT"
-        
-        if len(anomalies['zero_utilization']) > 0:
-            decisions.append("🔧 Vérifier machines à l'arrêt")
-        
-        # Décisions basées sur LLM
-        if not qc_result['valid']:
-            decisions.append("⚠️ Analyse LLM nécessite révision")
+        # Taille de chaque catégorie d'anomalies, calculée une seule fois
+        counts = {category: len(ids) for category, ids in anomalies.items()}
         
-        if "risque" in llm_result["text"].lower():
-            decisions.append("📊 Audit approfondi recommandé")
+        for condition, decision, urgent in self.RULES:
+            if condition(summary, counts, llm_result, qc_result):
+                decisions.append(decision)
+                if urgent:
+                    priority = "URGENT"
         
         self.send_message(f"Priorité: {priority} | {len(decisions)} décisions")
         
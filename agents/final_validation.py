@@ -1,15 +1,50 @@
+import re
 from agents.base_agent import BaseAgent
+
+REQUIRED_SECTIONS = ("KPI CLÉS", "ANOMALIES", "DÉCISIONS", "TRAÇABILITÉ")
+# Toutes les sections recherchées en une seule passe sur le rapport
+_SECTIONS_RE = re.compile("|".join(re.escape(section) for section in REQUIRED_SECTIONS))
+# Caractères conservés entre deux morceaux pour une section à cheval
+_TAIL_LEN = max(len(section) for section in REQUIRED_SECTIONS) - 1
+
 class FinalValidationAgent(BaseAgent):
+    __slots__ = ("_found", "_tail")
+    
+    def __init__(self, name):
+        super().__init__(name)
+        self.reset()
+    
+    def reset(self):
+        """Réinitialise l'état de validation incrémentale"""
+        self._found = set()
+        self._tail = ""
+    
+    def validate_chunk(self, text):
+        """Parcourt uniquement le nouveau morceau du rapport"""
+        if len(self._found) == len(REQUIRED_SECTIONS):
+            return
+        buffer = self._tail + text
+        for match in _SECTIONS_RE.finditer(buffer):
+            self._found.add(match.group())
+            if len(self._found) == len(REQUIRED_SECTIONS):
+                break
+        self._tail = buffer[-_TAIL_LEN:]
+    
     def validate_report(self, report, decisions):
         """Validation finale avant publication"""
+        self.reset()
+        self.validate_chunk(report)
+        return self.finalize(decisions)
+    
+    def finalize(self, decisions):
+        """Validation finale à partir des morceaux déjà reçus"""
         self.send_message("Validation finale du rapport")
         
         issues = []
         
         # Vérifier complétude
-        required_sections = ["KPI CLÉS", "ANOMALIES", "DÉCISIONS", "TRAÇABILITÉ"]
-        for section in required_sections:
-            if section not in report:
+        for section in REQUIRED_SECTIONS:
+            if section not in self._found:
                 issues.append(f"Section manquante: {section}")
         
         # Vérifier cohérence décisions
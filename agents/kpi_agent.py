@@ -4,6 +4,8 @@ import numpy as np
 
 
 class KPIAgent(BaseAgent):
+    __slots__ = ()
+
     def compute_kpis(self, df):
         self.send_message("Calcul des KPI de production")
 
@@ -20,11 +22,9 @@ class KPIAgent(BaseAgent):
             np.nan
         )
 
-        df['Stability_Index'] = (
-            df['Temperature_C'] +
-            df['Vibration_mms'] +
-            df['Sound_dB']
-        ) / 3
+        # Moyenne des trois capteurs en une seule opération NumPy
+        sensors = df[['Temperature_C', 'Vibration_mms', 'Sound_dB']].to_numpy(dtype=np.float64)
+        df['Stability_Index'] = sensors.mean(axis=1)
 
         df['AI_Override_Rate'] = np.where(
             df['Operational_Hours'] > 0,
@@ -1,62 +1,176 @@
+import time
+import httpx
 from google import genai
+from google.genai import errors, types
 from agents.base_agent import BaseAgent
+from agents.analysis import select_critical_machines
+from agents.llm_cache import LLMResponseCache, kpi_key
 
-class LLMInsightAgent(BaseAgent):
-    def __init__(self, name="LLM Insights"):
-        super().__init__(name)
-        self.client = genai.Client()
-    
-    def interpret(self, summary, anomalies, df=None, top_n=10):
-        self.send_message("Génération d'insights via LLM")
-        
-        # Machines critiques
-        critical_machines = []
-        if df is not None:
-            critical_df = df[df['Utilization_Rate'] < 0.4]
-            critical_machines = critical_df[['Machine_ID','Machine_Type']].head(top_n).to_dict(orient='records')
-        
-        # Prompt enrichi
-        prompt = f"""
-Tu es un expert en pilotage industriel. Analyse ces données:
+# Partie fixe du prompt, transmise en instruction système : préfixe identique à chaque appel
+_MISSION = (
+    "MISSION:\n"
+    "1. Identifie les 3 problèmes majeurs\n"
+    "2. Propose 3 actions concrètes et chiffrées\n"
+    "3. Estime l'impact potentiel sur la production\n"
+)
+_SYSTEM_INSTRUCTION = "Tu es un expert en pilotage industriel.\n\n" + _MISSION
+_GENERATION_CONFIG = types.GenerateContentConfig(system_instruction=_SYSTEM_INSTRUCTION)
+
+# Partie variable, analysée une fois au chargement du module
+_PROMPT_TEMPLATE = """Analyse ces données:
 
 KPI MOYENS:
-- Utilisation: {summary['avg_utilization']:.2%}
-- Efficacité énergétique: {summary['avg_energy_efficiency']:.2f} kW/h
-- Stabilité: {summary['avg_stability']:.2f}
-- Machines critiques: {summary['critical_machine_count']}/{summary['total_machines']}
+- Utilisation: {avg_utilization:.2%}
+- Efficacité énergétique: {avg_energy_efficiency:.2f} kW/h
+- Stabilité: {avg_stability:.2f}
+- Machines critiques: {critical_machine_count}/{total_machines}
 
 ANOMALIES DÉTECTÉES:
-- Température élevée: {len(anomalies['high_temperature'])} machines
-- Vibrations élevées: {len(anomalies['high_vibration'])} machines
-- Pics énergétiques: {len(anomalies['energy_spikes'])} machines
+- Température élevée: {high_temperature} machines
+- Vibrations élevées: {high_vibration} machines
+- Pics énergétiques: {energy_spikes} machines
 
 MACHINES CRITIQUES (top {top_n}):
 """
-        if critical_machines:
-            for m in critical_machines:
-                prompt += f"- {m['Machine_ID']} ({m['Machine_Type']})\n"
+
+_CLIENT = None
+
+# Erreurs de l'API ou du transport qui ouvrent le disjoncteur de l'agent
+_API_ERRORS = (errors.APIError, httpx.TransportError, TimeoutError, ConnectionError)
+
+def _get_client():
+    """Client Gemini du processus, créé seulement quand un appel LLM est nécessaire"""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = genai.Client()
+    return _CLIENT
+
+class LLMInsightAgent(BaseAgent):
+    __slots__ = ("client", "_response_cache", "_open_until")
+    
+    # Nombre de réponses LLM conservées (LRU) et durée de validité en secondes
+    CACHE_SIZE = 128
+    CACHE_TTL = 3600
+    # Après une erreur d'API, fallback direct pendant ce délai (secondes)
+    CIRCUIT_OPEN_SECONDS = 60
+
+    def __init__(self, name="LLM Insights", client=None):
+        super().__init__(name)
+        # Client Gemini injecté ; sinon client du module, créé au premier appel
+        self.client = client
+        self._response_cache = LLMResponseCache(self.CACHE_SIZE, self.CACHE_TTL)
+        # Disjoncteur propre à l'agent (et donc à son client)
+        self._open_until = 0.0
+    
+    def interpret(self, summary, anomalies, df=None, top_n=10, use_cache=True, retry_hint=None,
+                  critical_machines=None):
+        self.send_message("Génération d'insights via LLM")
+        early, prompt, cache_key = self._prepare(summary, anomalies, df, top_n, use_cache, retry_hint,
+                                                 critical_machines)
+        if early is not None:
+            return early
         
-        prompt += """
-MISSION:
-1. Identifie les 3 problèmes majeurs
-2. Propose 3 actions concrètes et chiffrées
-3. Estime l'impact potentiel sur la production
-"""
+        try:
+            response = self._client().models.generate_content(
+                model="gemini-2.5-flash",
+                contents=prompt,
+                config=_GENERATION_CONFIG
+            )
+        except Exception as e:
+            return self._error_result(summary, e)
+        return self._success_result(cache_key, response.text)
+    
+    async def interpret_async(self, summary, anomalies, df=None, top_n=10, use_cache=True, retry_hint=None,
+                              critical_machines=None):
+        """Variante asynchrone de interpret, à combiner avec asyncio.gather"""
+        self.send_message("Génération d'insights via LLM (async)")
+        early, prompt, cache_key = self._prepare(summary, anomalies, df, top_n, use_cache, retry_hint,
+                                                 critical_machines)
+        if early is not None:
+            return early
         
         try:
-            response = self.client.models.generate_content(
+            response = await self._client().aio.models.generate_content(
                 model="gemini-2.5-flash",
-                contents=prompt
+                contents=prompt,
+                config=_GENERATION_CONFIG
             )
-            self.send_message("✅ Insights LLM générés")
-            return {
-                "text": response.text,
-                "status": "success"
-            }
         except Exception as e:
-            self.send_message(f"⚠️ Erreur LLM: {e}", "ERROR")
-            return {
-                "text": f"Analyse simplifiée: {summary['critical_machine_count']} machines nécessitent une attention urgente.",
-                "status": "fallback"
-            }
-
+            return self._error_result(summary, e)
+        return self._success_result(cache_key, response.text)
+    
+    def _prepare(self, summary, anomalies, df, top_n, use_cache, retry_hint, critical_machines):
+        """Résultat immédiat (cache ou disjoncteur ouvert) sinon None, puis prompt et clé de cache"""
+        # Machines critiques fournies par l'appelant (orchestrateur), sinon calculées depuis df
+        if critical_machines is None:
+            critical_machines = select_critical_machines(df, top_n) if df is not None else []
+        
+        prompt = self._build_prompt(summary, anomalies, critical_machines, top_n, retry_hint)
+        
+        # KPI arrondis, anomalies et machines identiques => même réponse
+        cache_key = kpi_key(summary, anomalies, critical_machines, top_n)
+        
+        # Un retry avec consignes doit produire une nouvelle réponse
+        cached = self._response_cache.get(cache_key) if use_cache and not retry_hint else None
+        if cached is not None:
+            return self._cached_result(cached), prompt, cache_key
+        
+        if time.monotonic() < self._open_until:
+            return self._fallback_result(summary, "API indisponible, appel suspendu"), prompt, cache_key
+        
+        return None, prompt, cache_key
+    
+    def _client(self):
+        return self.client if self.client is not None else _get_client()
+    
+    def _error_result(self, summary, error):
+        """Fallback après un échec d'appel ; seules les erreurs d'API ouvrent le disjoncteur"""
+        if isinstance(error, _API_ERRORS):
+            self._open_until = time.monotonic() + self.CIRCUIT_OPEN_SECONDS
+        return self._fallback_result(summary, error)
+    
+    def _cached_result(self, text):
+        self.send_message("✅ Insights LLM repris du cache")
+        return {
+            "text": text,
+            "status": "cached"
+        }
+    
+    def remember(self, llm_result):
+        """Met en cache une réponse acceptée par le contrôle qualité"""
+        if llm_result["status"] == "success":
+            self._response_cache.put(llm_result["cache_key"], llm_result["text"])
+    
+    def _success_result(self, cache_key, text):
+        # Pas de mise en cache ici : la réponse n'est pas encore validée
+        self.send_message("✅ Insights LLM générés")
+        return {
+            "text": text,
+            "status": "success",
+            "cache_key": cache_key
+        }
+    
+    def _fallback_result(self, summary, error):
+        self.send_message(f"⚠️ Erreur LLM: {error}", "ERROR")
+        return {
+            "text": f"Analyse simplifiée: {summary['critical_machine_count']} machines nécessitent une attention urgente.",
+            "status": "fallback"
+        }
+    
+    def _build_prompt(self, summary, anomalies, critical_machines, top_n, retry_hint=None):
+        """Construit la partie variable du prompt en une seule concaténation finale"""
+        values = {
+            **summary,
+            **{category: len(ids) for category, ids in anomalies.items()},
+            "top_n": top_n
+        }
+        parts = [_PROMPT_TEMPLATE.format_map(values)]
+        if critical_machines:
+            parts.extend(f"- {m['Machine_ID']} ({m['Machine_Type']})\n" for m in critical_machines)
+        else:
+            parts.append("Aucune machine critique détectée.\n")
+        # Retry : signaler les problèmes relevés pour obtenir une réponse différente
+        if retry_hint:
+            parts.append("\nPOINTS À CORRIGER (tentative précédente):\n")
+            parts.extend(f"- {issue}\n" for issue in retry_hint)
+        return "".join(parts)
@@ -0,0 +1,47 @@
+import time
+from collections import OrderedDict
+
+
+class LLMResponseCache:
+    """Cache LRU des réponses LLM, avec expiration après `ttl` secondes"""
+
+    def __init__(self, capacity=128, ttl=3600):
+        self.capacity = capacity
+        self.ttl = ttl
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def kpi_key(summary, anomalies, critical_machines, top_n):
+    """Clé arrondie : deux résumés quasi identiques partagent la même réponse"""
+    return (
+        round(summary['avg_utilization'], 2),
+        round(summary['avg_energy_efficiency'], 1),
+        round(summary['avg_stability'], 2),
+        summary['critical_machine_count'],
+        summary['total_machines'],
+        len(anomalies['high_temperature']),
+        len(anomalies['high_vibration']),
+        len(anomalies['energy_spikes']),
+        top_n,
+        tuple(m['Machine_ID'] for m in critical_machines)
+    )
@@ -1,3 +1,5 @@
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from agents.base_agent import BaseAgent
 from agents.data_collector import DataCollectorAgent
 from agents.validation import ValidationAgent
@@ -10,24 +12,46 @@ from agents.quality_control import QualityControlAgent
 from agents.decision import DecisionAgent
 from agents.report import ReportAgent
 from agents.final_validation import FinalValidationAgent
-from agents.base_agent import BaseAgent
+
+
+class _AgentRegistry(Mapping):
+    """Agents construits au premier accès ; clés, len() et `in` couvrent tous les agents déclarés"""
+    def __init__(self, factories):
+        self._factories = factories
+        self._agents = {}
+    
+    def __getitem__(self, key):
+        agent = self._agents.get(key)
+        if agent is None:
+            agent = self._agents[key] = self._factories[key]()
+        return agent
+    
+    def __contains__(self, key):
+        # Sans construire l'agent
+        return key in self._factories
+    
+    def __iter__(self):
+        return iter(self._factories)
+    
+    def __len__(self):
+        return len(self._factories)
 
 
 class SystemOrchestrator:
-    def __init__(self):
-        self.agents = {
-            "collector": DataCollectorAgent("Collecteur"),
-            "validator": ValidationAgent("Validateur"),
-            "preprocessor": PreprocessingAgent("Prétraitement"),
-            "kpi": KPIAgent("Agent KPI"),
-            "analyzer": AnalysisAgent("Analyseur"),
-            "anomaly": AnomalyDetectorAgent("Détecteur Anomalies"),
-            "llm": LLMInsightAgent("LLM Insights"),
-            "quality": QualityControlAgent("Contrôle Qualité"),
-            "decision": DecisionAgent("Décisionnaire"),
-            "reporter": ReportAgent("Rapporteur"),
-            "final_validator": FinalValidationAgent("Validateur Final")
-        }
+    def __init__(self, llm_client=None):
+        self.agents = _AgentRegistry({
+            "collector": lambda: DataCollectorAgent("Collecteur"),
+            "validator": lambda: ValidationAgent("Validateur"),
+            "preprocessor": lambda: PreprocessingAgent("Prétraitement"),
+            "kpi": lambda: KPIAgent("Agent KPI"),
+            "analyzer": lambda: AnalysisAgent("Analyseur"),
+            "anomaly": lambda: AnomalyDetectorAgent("Détecteur Anomalies"),
+            "llm": lambda: LLMInsightAgent("LLM Insights", client=llm_client),
+            "quality": lambda: QualityControlAgent("Contrôle Qualité"),
+            "decision": lambda: DecisionAgent("Décisionnaire"),
+            "reporter": lambda: ReportAgent("Rapporteur"),
+            "final_validator": lambda: FinalValidationAgent("Validateur Final")
+        })
         self.validation_history = []
         self.max_retries = 3
     
@@ -37,100 +61,126 @@ class SystemOrchestrator:
         print("🚀 DÉMARRAGE DU SYSTÈME MULTI-AGENT")
         print("="*60 + "\n")
         
-        # ÉTAPE 1: Chargement
-        data_package = self.agents["collector"].load_data(data_path)
-        
-        # ÉTAPE 2: Validation brute
-        validation1 = self.agents["validator"].validate_raw_data(data_package)
-        self.validation_history.append({
-            "agent": "Validator",
-            "valid": validation1["valid"],
-            "message": "Validation données brutes"
-        })
-        
-        if not validation1["valid"]:
-            return {"error": "Données brutes invalides", "issues": validation1["issues"]}
-        
-        # ÉTAPE 3: Preprocessing
-        cleaned_package = self.agents["preprocessor"].clean_data(validation1)
-        
-        # ÉTAPE 4: Revalidation post-nettoyage
-        validation2 = self.agents["validator"].validate_processed_data(cleaned_package["data"])
-        self.validation_history.append({
-            "agent": "Validator",
-            "valid": validation2["valid"],
-            "message": "Validation post-traitement"
-        })
-        
-        if not validation2["valid"]:
-            print("⚠️ Retraitement nécessaire...")
-            # Ici on pourrait implémenter une boucle de retraitement
-        
-        # ÉTAPE 5: KPI
-        df = self.agents["kpi"].compute_kpis(validation2["data"])
+        try:
+            # ÉTAPE 1: Chargement
+            data_package = self.agents["collector"].load_data(data_path)
         
-        # ÉTAPE 6: Analyse
-        summary = self.agents["analyzer"].analyze(df)
+            # ÉTAPE 2: Validation brute
+            validation1 = self.agents["validator"].validate_raw_data(data_package)
+            self.validation_history.append({
+                "agent": "Validator",
+                "valid": validation1["valid"],
+                "message": "Validation données brutes"
+            })
         
-        # ÉTAPE 7: Détection anomalies
-        anomalies = self.agents["anomaly"].detect_anomalies(df, summary)
+            if not validation1["valid"]:
+                BaseAgent.flush_messages()
+                return {"error": "Données brutes invalides", "issues": validation1["issues"]}
         
-        # ÉTAPE 8-9: LLM avec boucle de retry
-        retry_count = 0
-        llm_result = None
-        qc_result = None
+            # ÉTAPE 3: Preprocessing
+            cleaned_package = self.agents["preprocessor"].clean_data(validation1)
         
-        while retry_count < self.max_retries:
-            llm_result = self.agents["llm"].interpret(summary, anomalies, df)
-            qc_result = self.agents["quality"].validate_llm_output(llm_result, summary)
-            
+            # ÉTAPE 4: Revalidation post-nettoyage
+            validation2 = self.agents["validator"].validate_processed_data(cleaned_package["data"])
             self.validation_history.append({
-                "agent": "QualityControl",
-                "valid": qc_result["valid"],
-                "message": f"Validation LLM (tentative {retry_count + 1})"
+                "agent": "Validator",
+                "valid": validation2["valid"],
+                "message": "Validation post-traitement"
             })
+        
+            if not validation2["valid"]:
+                BaseAgent.flush_messages()
+                print("⚠️ Retraitement nécessaire...")
+                # Ici on pourrait implémenter une boucle de retraitement
+        
+            # ÉTAPE 5: KPI
+            df = self.agents["kpi"].compute_kpis(validation2["data"])
+        
+            # ÉTAPES 6-7: Analyse, machines critiques et détection d'anomalies, indépendantes, en parallèle
+            # (la détection n'utilise pas le résumé de l'analyse)
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                summary_future = pool.submit(self.agents["analyzer"].analyze, df)
+                critical_future = pool.submit(self.agents["analyzer"].critical_machines, df)
+                anomalies_future = pool.submit(self.agents["anomaly"].detect_anomalies, df, None)
+                summary = summary_future.result()
+                critical_machines = critical_future.result()
+                anomalies = anomalies_future.result()
+        
+            # ÉTAPE 8-9: LLM avec boucle de retry
+            retry_count = 0
+            llm_result = None
+            qc_result = None
+            retry_hint = None
+        
+            while retry_count < self.max_retries:
+                # Un retry doit interroger le LLM, pas relire la réponse rejetée
+                llm_result = self.agents["llm"].interpret(
+                    summary, anomalies, df, use_cache=retry_count == 0, retry_hint=retry_hint,
+                    critical_machines=critical_machines
+                )
+                qc_result = self.agents["quality"].validate_llm_output(llm_result, summary)
             
-            if qc_result["valid"] or not qc_result["retry_needed"]:
-                break
+                self.validation_history.append({
+                    "agent": "QualityControl",
+                    "valid": qc_result["valid"],
+                    "message": f"Validation LLM (tentative {retry_count + 1})"
+                })
             
-            retry_count += 1
-            print(f"🔄 Retry LLM {retry_count}/{self.max_retries}")
-        
-        # ÉTAPE 10: Décisions
-        decisions = self.agents["decision"].decide(summary, anomalies, llm_result, qc_result)
-        
-        # ÉTAPE 11: Rapport
-        report = self.agents["reporter"].generate_report(
-            summary, anomalies, llm_result, decisions, self.validation_history
-        )
-        
-        # ÉTAPE 12: Validation finale avec boucle
-        final_retry = 0
-        while final_retry < self.max_retries:
-            final_validation = self.agents["final_validator"].validate_report(report, decisions)
+                # Seules les réponses validées sont réutilisées aux exécutions suivantes
+                if qc_result["valid"]:
+                    self.agents["llm"].remember(llm_result)
             
-            self.validation_history.append({
-                "agent": "FinalValidator",
-                "valid": final_validation["valid"],
-                "message": f"Validation finale (tentative {final_retry + 1})"
-            })
+                if qc_result["valid"] or not qc_result["retry_needed"]:
+                    break
             
-            if final_validation["valid"]:
-                break
+                # Mêmes problèmes que ceux déjà signalés : le prompt ne changerait pas
+                if qc_result["issues"] == retry_hint:
+                    break
+                retry_hint = qc_result["issues"]
+                retry_count += 1
+                BaseAgent.flush_messages()
+                print(f"🔄 Retry LLM {retry_count}/{self.max_retries}")
+        
+            # ÉTAPE 10: Décisions
+            decisions = self.agents["decision"].decide(summary, anomalies, llm_result, qc_result)
+        
+            # ÉTAPE 11: Rapport
+            report = self.agents["reporter"].generate_report(
+                summary, anomalies, llm_result, decisions, self.validation_history
+            )
+        
+            # ÉTAPE 12: Validation finale avec boucle
+            final_retry = 0
+            while final_retry < self.max_retries:
+                final_validation = self.agents["final_validator"].validate_report(report, decisions)
             
-            final_retry += 1
-            print(f"🔄 Correction rapport {final_retry}/{self.max_retries}")
-            # Ici on pourrait régénérer le rapport
-        
-        print("\n" + "="*60)
-        print("✅ PIPELINE TERMINÉ")
-        print("="*60 + "\n")
-        
-        return {
-            "report": report,
-            "summary": summary,
-            "anomalies": anomalies,
-            "decisions": decisions,
-            "df": df,
-            "validation_history": self.validation_history
-        }
\ No newline at end of file
+                self.validation_history.append({
+                    "agent": "FinalValidator",
+                    "valid": final_validation["valid"],
+                    "message": f"Validation finale (tentative {final_retry + 1})"
+                })
+            
+                if final_validation["valid"]:
+                    break
+            
+                final_retry += 1
+                BaseAgent.flush_messages()
+                print(f"🔄 Correction rapport {final_retry}/{self.max_retries}")
+                # Ici on pourrait régénérer le rapport
+        
+            BaseAgent.flush_messages()
+            print("\n" + "="*60)
+            print("✅ PIPELINE TERMINÉ")
+            print("="*60 + "\n")
+        
+            return {
+                "report": report,
+                "summary": summary,
+                "anomalies": anomalies,
+                "decisions": decisions,
+                "df": df,
+                "validation_history": self.validation_history
+            }
+        finally:
+            # Vide le tampon même si une étape lève une exception
+            BaseAgent.flush_messages()
\ No newline at end of file
@@ -3,6 +3,8 @@ import pandas as pd
 from agents.base_agent import BaseAgent
 
 class PreprocessingAgent(BaseAgent):
+    __slots__ = ("cleaning_report",)
+    
     def __init__(self, name="Prétraitement"):
         super().__init__(name)
         self.cleaning_report = {}
@@ -10,9 +12,9 @@ class PreprocessingAgent(BaseAgent):
     def clean_data(self, validation_result):
         """Nettoyage avec rapport détaillé"""
         self.send_message("Nettoyage et préparation des données")
-        df = validation_result["data"].copy()
+        raw = validation_result["data"]
         
-        initial_rows = len(df)
+        initial_rows = len(raw)
         
         # Colonnes numériques
         numeric_cols = [
@@ -21,22 +23,45 @@ class PreprocessingAgent(BaseAgent):
             'AI_Override_Events', 'Installation_Year'
         ]
         
-        # Conversion forcée
+        # Conversion forcée, hors du DataFrame source (pas de copie complète préalable),
+        # puis réduction float64 -> float32 et entiers -> plus petit type suffisant
+        converted = {}
         for col in numeric_cols:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+            if col in raw.columns:
+                values = pd.to_numeric(raw[col], errors='coerce')
+                kind = 'float' if values.dtype.kind == 'f' else 'integer'
+                converted[col] = pd.to_numeric(values, downcast=kind)
+        
+        # Suppression lignes invalides : seules les lignes gardées sont copiées
+        keep = (converted['Operational_Hours'] > 0).to_numpy()
+        df = raw.loc[keep].assign(**{col: values[keep] for col, values in converted.items()})
         
-        # Suppression lignes invalides
-        df = df[df['Operational_Hours'] > 0]
+        # Type de machine : peu de valeurs distinctes, stocké en catégorie
+        if 'Machine_Type' in df.columns:
+            df['Machine_Type'] = df['Machine_Type'].astype('category')
         
-        # Remplissage NaN
-        df[numeric_cols] = df[numeric_cols].fillna(df[numeric_cols].median())
+        # Remplissage NaN : médianes et remplacement sur le bloc numérique en 2-D NumPy
+        cols = list(converted)
+        arr = df[cols].to_numpy(dtype=np.float64)
+        missing = np.isnan(arr)
+        has_missing = missing.any(axis=0)
+        fill_count = int(missing.sum())
+        if fill_count:
+            # Seules les colonnes avec NaN sont réécrites (les entiers gardent leur dtype)
+            fill_cols = [col for col, flag in zip(cols, has_missing) if flag]
+            sub = arr[:, has_missing]
+            filled = np.where(missing[:, has_missing], np.nanmedian(sub, axis=0), sub)
+            # Chaque colonne reprend le dtype choisi à la conversion (float32 seulement si sans perte)
+            df[fill_cols] = pd.DataFrame(filled, index=df.index, columns=fill_cols).astype(
+                {col: converted[col].dtype for col in fill_cols}
+            )
         
         # Rapport de nettoyage
         self.cleaning_report = {
             "rows_removed": initial_rows - len(df),
             "rows_remaining": len(df),
-            "removal_rate": (initial_rows - len(df)) / initial_rows
+            "removal_rate": (initial_rows - len(df)) / initial_rows,
+            "values_filled": fill_count
         }
         
         self.send_message(f"Nettoyage terminé: {self.cleaning_report['rows_removed']} lignes supprimées")
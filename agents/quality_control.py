@@ -1,5 +1,12 @@
+import re
 from agents.base_agent import BaseAgent
+
+# Recherche insensible à la casse, sans copie minuscule du texte LLM
+_URGENT_RE = re.compile(r"urgent", re.IGNORECASE)
+
 class QualityControlAgent(BaseAgent):
+    __slots__ = ()
+    
     def validate_llm_output(self, llm_result, summary):
         """Vérifie la cohérence de l'analyse LLM"""
         self.send_message("Contrôle qualité de l'analyse LLM")
@@ -15,7 +22,7 @@ class QualityControlAgent(BaseAgent):
             issues.append("LLM en mode dégradé")
         
         # Vérifier cohérence avec les KPI
-        if summary['critical_machine_count'] > 10 and "urgent" not in text.lower():
+        if summary['critical_machine_count'] > 10 and not _URGENT_RE.search(text):
             issues.append("Sous-estimation de la criticité")
         
         if issues:
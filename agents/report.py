@@ -2,11 +2,13 @@ from agents.base_agent import BaseAgent
 from datetime import datetime
 
 class ReportAgent(BaseAgent):
+    __slots__ = ()
+    
     def generate_report(self, summary, anomalies, llm_result, decisions, validation_history):
         """Génère un rapport complet avec traçabilité"""
         self.send_message("Génération du rapport final")
         
-        report = f"""
+        parts = [f"""
 ╔═══════════════════════════════════════════════════════╗
 ║     RAPPORT DE PERFORMANCE INDUSTRIELLE               ║
 ║     Priorité: {decisions['priority']}                              ║
@@ -33,24 +35,27 @@ class ReportAgent(BaseAgent):
 
 ⚡ DÉCISIONS RECOMMANDÉES
 ------------------------
-"""
-        for i, decision in enumerate(decisions['decisions'], 1):
-            report += f"{i}. {decision}\n"
+"""]
+        parts.extend(f"{i}. {decision}\n" for i, decision in enumerate(decisions['decisions'], 1))
         
-        report += f"""
+        parts.append(f"""
 
 🔄 TRAÇABILITÉ
 -------------
 Validations effectuées: {len(validation_history)}
-"""
-        for val in validation_history:
-            status = "✅" if val['valid'] else "❌"
-            report += f"{status} {val['agent']}: {val['message']}\n"
+""")
+        parts.extend(
+            f"{'✅' if val['valid'] else '❌'} {val['agent']}: {val['message']}\n"
+            for val in validation_history
+        )
         
-        report += f"""
+        parts.append(f"""
 
 {'='*60}
 Rapport généré le {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
+""")
+        
+        # Une seule concaténation finale
+        report = "".join(parts)
         
         return report
\ No newline at end of file
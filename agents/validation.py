@@ -1,5 +1,7 @@
 from agents.base_agent import BaseAgent
 class ValidationAgent(BaseAgent):
+    __slots__ = ("validation_threshold",)
+    
     def __init__(self, name="Validateur"):
         super().__init__(name)
         self.validation_threshold = {
@@ -26,8 +28,8 @@ class ValidationAgent(BaseAgent):
         if missing_cols:
             issues.append(f"Colonnes manquantes: {missing_cols}")
         
-        # Vérifier taux de nulls
-        null_percentage = df.isnull().sum().sum() / (len(df) * len(df.columns))
+        # Vérifier taux de nulls (une seule réduction sur la matrice booléenne)
+        null_percentage = df.isna().to_numpy().mean()
         if null_percentage > self.validation_threshold["max_null_percentage"]:
             issues.append(f"Trop de valeurs manquantes: {null_percentage:.2%}")
         
@@ -48,7 +50,7 @@ class ValidationAgent(BaseAgent):
             issues.append("Trop de données supprimées")
         
         # Vérifier présence de NaN
-        if df.isnull().any().any():
+        if df.isna().to_numpy().any():
             issues.append("Des NaN persistent après nettoyage")
         
         if issues:
@@ -120,10 +120,13 @@ if file_uploaded is not None:
                 
                 # Top machines critiques
                 st.subheader("Top 10 Machines Critiques")
-                critical_df = df[df['Utilization_Rate'] < 0.4].sort_values('Utilization_Rate')
+                critical_df = df.loc[
+                    df['Utilization_Rate'] < 0.4,
+                    ['Machine_ID', 'Machine_Type', 'Utilization_Rate',
+                     'Energy_Efficiency', 'Stability_Index']
+                ].sort_values('Utilization_Rate')
                 st.dataframe(
-                    critical_df[['Machine_ID', 'Machine_Type', 'Utilization_Rate', 
-                                'Energy_Efficiency', 'Stability_Index']].head(10),
+                    critical_df.head(10),
                     use_container_width=True
                 )
             
@@ -170,10 +173,11 @@ if file_uploaded is not None:
                 fig = go.Figure()
                 
                 # Points normaux
-                normal_df = df[~df['Machine_ID'].isin(
+                scatter_cols = ['Temperature_C', 'Vibration_mms']
+                normal_df = df.loc[~df['Machine_ID'].isin(
                     anomalies['high_temperature'] + 
                     anomalies['high_vibration']
-                )]
+                ), scatter_cols]
                 fig.add_trace(go.Scatter(
                     x=normal_df['Temperature_C'],
                     y=normal_df['Vibration_mms'],
@@ -183,7 +187,7 @@ if file_uploaded is not None:
                 ))
                 
                 # Anomalies température
-                temp_df = df[df['Machine_ID'].isin(anomalies['high_temperature'])]
+                temp_df = df.loc[df['Machine_ID'].isin(anomalies['high_temperature']), scatter_cols]
                 fig.add_trace(go.Scatter(
                     x=temp_df['Temperature_C'],
                     y=temp_df['Vibration_mms'],
@@ -193,7 +197,7 @@ if file_uploaded is not None:
                 ))
                 
                 # Anomalies vibration
-                vib_df = df[df['Machine_ID'].isin(anomalies['high_vibration'])]
+                vib_df = df.loc[df['Machine_ID'].isin(anomalies['high_vibration']), scatter_cols]
                 fig.add_trace(go.Scatter(
                     x=vib_df['Temperature_C'],
                     y=vib_df['Vibration_mms'],